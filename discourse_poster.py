@@ -4,15 +4,26 @@ Script to post job listings to the CrewAI Discourse forum.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 from datetime import datetime, timezone
 import json
+import hashlib
+import logging
 import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging; set LOG_LEVEL=DEBUG to print the Discourse API responses
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    format='%(message)s'
+)
+
 # Discourse API configuration
 DISCOURSE_URL = os.getenv('DISCOURSE_URL')
 API_KEY = os.getenv('DISCOURSE_API_KEY')
@@ -22,6 +33,19 @@ CATEGORY_ID = int(os.getenv('DISCOURSE_CATEGORY_ID'))
 if not API_KEY:
     raise ValueError("DISCOURSE_API_KEY environment variable is not set")
 
+# Discourse limits admin API keys to 60 requests per minute
+MIN_REQUEST_INTERVAL = 1.0
+
+# Hash of the last post body, used to skip posting unchanged listings
+POST_HASH_FILE = '.last_post_hash'
+# Lines that carry the refresh time and change on every run
+TIMESTAMP_PREFIXES = ("*Last Updated:", "*This post is automatically updated daily.")
+
+# Rendered company sections from the previous run, keyed by company name
+FORMAT_CACHE_FILE = '.format_cache.json'
+# Columns that feed a company section; a section is re-rendered only when these change
+SECTION_COLUMNS = ['Title', 'Link', 'is_new', 'Location', 'Job Type', 'Time_Posted']
+
 class DiscourseJobPoster:
     def __init__(self, discourse_url, api_key, api_username, category_id):
         self.base_url = discourse_url
@@ -29,14 +53,34 @@ class DiscourseJobPoster:
         self.api_username = api_username
         self.category_id = category_id
         self.csrf_token = None
+        self.last_request_time = 0.0
+        
+        # One keep-alive session for every call, retrying transient failures
+        self.session = requests.Session()
+        retries = Retry(
+            total=5,
+            backoff_factor=2,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def throttle(self):
+        """Wait so consecutive API requests are at least MIN_REQUEST_INTERVAL apart."""
+        wait = MIN_REQUEST_INTERVAL - (time.monotonic() - self.last_request_time)
+        if wait > 0:
+            time.sleep(wait)
+        self.last_request_time = time.monotonic()
         
     def get_csrf_token(self):
         """Get CSRF token from Discourse."""
-        session = requests.Session()
-        response = session.get(f"{self.base_url}/session/csrf.json")
+        self.throttle()
+        response = self.session.get(f"{self.base_url}/session/csrf.json")
         if response.status_code == 200:
             self.csrf_token = response.json()['csrf']
-            return session
+            return self.csrf_token
         raise Exception("Failed to get CSRF token")
 
     def get_headers(self, with_csrf=False):
@@ -53,57 +97,68 @@ class DiscourseJobPoster:
     def format_job_post_content(self, jobs_df):
         """Format jobs into a nice Discourse post."""
         today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        
-        content = [
-            "# 🤖 CrewAI Job Listings\n",
-            f"*Last Updated: {today}*\n\n",
-            "Looking for roles in the CrewAI ecosystem? Here are the latest opportunities:\n\n"
-        ]
-
-        # Group jobs by company and sort by company name
-        jobs_df = jobs_df.sort_values('Company')
-        companies = jobs_df[jobs_df['Status'] == 'Active'].groupby('Company')
-        
-        for company, jobs in companies:
-            content.append(f"### {company}\n")
-            # Sort jobs by date (newest first)
-            jobs = jobs.sort_values('First Seen', ascending=False)
-            
-            for _, job in jobs.iterrows():
-                is_new = job['First Seen'] == today
-                new_badge = " 🆕" if is_new else ""
-                
-                location = job['Location'] if pd.notna(job['Location']) else 'Location not specified'
-                job_type = job['Job Type'] if pd.notna(job['Job Type']) else 'Not specified'
-                
-                content.extend([
-                    f"**[{job['Title']}]({job['Link']})**{new_badge}\n",
-                    f"📍 {location}" + 
-                    (f" | 💼 {job_type}" if job_type != "Not specified" else "") + 
-                    f" | ⏰ Posted {job['Time_Posted']}\n\n"
-                ])
-
-        content.extend([
-            "---\n\n",
-            "### Summary\n",
-            f"- 📊 Total Active Jobs: {len(jobs_df[jobs_df['Status'] == 'Active'])}\n",
-            f"- 🆕 New Today: {len(jobs_df[jobs_df['First Seen'] == today])}\n",
-            "\n",
-            "If you're interested in contributing to CrewAI, check out our [contributing guide](https://docs.crewai.com/Contributing/)\n\n",
-            "*This post is automatically updated daily. Last refresh: " + 
-            f"{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')} UTC*\n\n",
-            "ℹ️ Having trouble with a job link? Let us know in the comments below."
-        ])
-        
-        return ''.join(content)
+
+        # Fill in missing values and flag new jobs column-wise, not per row
+        active = jobs_df.loc[jobs_df['Status'] == 'Active'].copy()
+        active['Location'] = active['Location'].fillna('Location not specified')
+        active['Job Type'] = active['Job Type'].fillna('Not specified')
+        active['is_new'] = active['First Seen'].eq(today)
+        # Sort once: companies by name, each company's jobs newest first
+        active = active.sort_values(['Company', 'First Seen'], ascending=[True, False])
+
+        cache = load_format_cache()
+        fresh_cache = {}
+
+        def rows():
+            yield "# 🤖 CrewAI Job Listings\n"
+            yield f"*Last Updated: {today}*\n\n"
+            yield "Looking for roles in the CrewAI ecosystem? Here are the latest opportunities:\n\n"
+
+            # Groups arrive in the pre-sorted order, so neither needs re-sorting
+            for company, jobs in active.groupby('Company', sort=False):
+                # Reuse last run's section when none of its inputs changed
+                key = hash_section(jobs)
+                cached = cache.get(str(company))
+                if cached and cached[0] == key:
+                    section = cached[1]
+                else:
+                    section = self.format_company_section(company, jobs)
+                fresh_cache[str(company)] = [key, section]
+                yield section
+
+            yield "---\n\n"
+            yield "### Summary\n"
+            yield f"- 📊 Total Active Jobs: {len(active)}\n"
+            yield f"- 🆕 New Today: {jobs_df['First Seen'].eq(today).sum()}\n"
+            yield "\n"
+            yield "If you're interested in contributing to CrewAI, check out our [contributing guide](https://docs.crewai.com/Contributing/)\n\n"
+            yield ("*This post is automatically updated daily. Last refresh: "
+                   f"{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')} UTC*\n\n")
+            yield "ℹ️ Having trouble with a job link? Let us know in the comments below."
+
+        content = ''.join(rows())
+        save_format_cache(fresh_cache)
+        return content
+
+    def format_company_section(self, company, jobs):
+        """Format one company's heading and its jobs."""
+        lines = [f"### {company}\n"]
+        for title, link, is_new, location, job_type, posted in zip(
+            *(jobs[col] for col in SECTION_COLUMNS)
+        ):
+            new_badge = " 🆕" if is_new else ""
+            type_info = f" | 💼 {job_type}" if job_type != "Not specified" else ""
+            lines.append(f"**[{title}]({link})**{new_badge}\n")
+            lines.append(f"📍 {location}{type_info} | ⏰ Posted {posted}\n\n")
+        return ''.join(lines)
 
     def create_or_update_post(self, title, content):
         """Create a new post or update existing one."""
         try:
             print("Starting post creation/update process...")
             
-            # Get CSRF token and session
-            session = self.get_csrf_token()
+            # Get CSRF token
+            self.get_csrf_token()
             print("Got CSRF token successfully")
             
             # Create new topic
@@ -120,7 +175,8 @@ class DiscourseJobPoster:
             print(f"URL: {create_url}")
             print(f"Category ID: {self.category_id}")
             
-            response = session.post(
+            self.throttle()
+            response = self.session.post(
                 create_url,
                 headers=self.get_headers(with_csrf=True),
                 json=create_data
@@ -130,7 +186,8 @@ class DiscourseJobPoster:
             
             try:
                 response_data = response.json()
-                print(f"Response Data: {json.dumps(response_data, indent=2)}")
+                # Only serialized when debug logging is enabled
+                logging.debug("Response Data: %s", response_data)
                 
                 if response.status_code == 200:
                     topic_id = response_data.get('topic_id')
@@ -150,12 +207,56 @@ class DiscourseJobPoster:
             print(f"❌ Error: {str(e)}")
             return False
 
-def post_jobs_to_discourse(excel_file='job_listings.xlsx'):
+def load_jobs(jobs_file):
+    """Read jobs from a Parquet store or a legacy Excel spreadsheet."""
+    if os.path.splitext(jobs_file)[1].lower() == '.parquet':
+        df = pd.read_parquet(jobs_file)
+    else:
+        df = pd.read_excel(jobs_file, engine='calamine')
+    # Parquet keeps First Seen as a datetime; compare against today's date string
+    df['First Seen'] = pd.to_datetime(df['First Seen']).dt.strftime('%Y-%m-%d')
+    return df
+
+def hash_section(jobs):
+    """Return a stable hash of the columns that feed a company section."""
+    row_hashes = pd.util.hash_pandas_object(jobs[SECTION_COLUMNS], index=False)
+    return hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()
+
+def load_format_cache():
+    """Load the rendered company sections from the previous run."""
+    try:
+        with open(FORMAT_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_format_cache(cache):
+    """Save the rendered company sections for the next run."""
+    try:
+        with open(FORMAT_CACHE_FILE, 'w') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Could not save format cache: {str(e)}")
+
+def hash_post_content(content):
+    """Hash a post body, ignoring the refresh timestamps that change on every run."""
+    body = '\n'.join(line for line in content.splitlines()
+                      if not line.startswith(TIMESTAMP_PREFIXES))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+def read_last_post_hash():
+    """Return the hash of the last posted body, or None if nothing was posted yet."""
+    if os.path.exists(POST_HASH_FILE):
+        with open(POST_HASH_FILE) as f:
+            return f.read().strip()
+    return None
+
+def post_jobs_to_discourse(jobs_file='job_listings.parquet'):
     """Main function to read jobs and post to Discourse."""
     try:
-        # Read jobs from Excel
-        df = pd.read_excel(excel_file)
-        print(f"📊 Read {len(df)} jobs from Excel file")
+        # Read jobs from the job store
+        df = load_jobs(jobs_file)
+        print(f"📊 Read {len(df)} jobs from {jobs_file}")
         
         # Initialize Discourse poster
         poster = DiscourseJobPoster(
@@ -169,9 +270,17 @@ def post_jobs_to_discourse(excel_file='job_listings.xlsx'):
         content = poster.format_job_post_content(df)
         title = "CrewAI Job Listings - Updated Daily"
         
+        # Skip the API call entirely when the listings have not changed
+        body_hash = hash_post_content(content)
+        if body_hash == read_last_post_hash():
+            print("\n⏭️ Job listings unchanged since the last post, skipping Discourse update")
+            return
+        
         success = poster.create_or_update_post(title, content)
         
         if success:
+            with open(POST_HASH_FILE, 'w') as f:
+                f.write(body_hash)
             print("\n🎉 Jobs successfully posted/updated on Discourse!")
             print(f"📊 Active Jobs: {len(df[df['Status'] == 'Active'])}")
             print(f"🆕 New Today: {len(df[df['First Seen'] == datetime.now(timezone.utc).strftime('%Y-%m-%d')])}")
@@ -3,38 +3,66 @@
 Job scraper for CrewAI job listings.
 """
 
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
-import time
+import numpy as np
 import pandas as pd
 import os
-import json
-import hashlib
 import logging
 import sys
 import platform
 from datetime import datetime, timezone
 
-# URL of the job listing site
-URL = "https://job.zip/jobs/crewai"
-FILE_NAME = "job_listings.xlsx"
+# URLs of the job listing sites, scraped concurrently
+URLS = ["https://job.zip/jobs/crewai"]
+FILE_NAME = "job_listings.parquet"
+# Legacy spreadsheet store, only read once to seed the Parquet store
+LEGACY_FILE_NAME = "job_listings.xlsx"
+# Human-readable spreadsheet, written on demand with --export-xlsx (not tracked)
+EXPORT_FILE_NAME = "job_listings_export.xlsx"
+# Columns hashed into each job's Job ID
+ID_COLUMNS = ('Title', 'Company', 'Location')
+# Columns filled in for every scraped job
+SCRAPED_COLUMNS = ('Title', 'Company', 'Location', 'Job Type', 'Time_Posted',
+                   'Link', 'First Seen', 'Last Seen', 'Status')
 
-# Configure logging
+# Anchor element wrapping each job card
+JOB_CARD_SELECTOR = "a.flex.flex-col[rel='noopener noreferrer']"
+# Pagination button below the job list
+LOAD_MORE_SELECTOR = "button:has-text('Load more jobs')"
+
+# Collects the raw fields of the job cards from index `start` onward in one browser call
+JOB_CARDS_SCRIPT = r"""
+([selector, start]) => Array.from(document.querySelectorAll(selector)).slice(start).map(
+    (a) => ({
+        title: a.querySelector('h3.font-bold')?.textContent,
+        company: a.querySelector('div.text-orange-600')?.textContent,
+        timePosted: a.querySelector('p.hidden.sm\\:flex')?.textContent,
+        paragraphs: Array.from(
+            a.querySelector('div.flex.flex-col.gap-1.mt-2')?.querySelectorAll('p') ?? [],
+            (p) => p.textContent
+        ),
+        link: a.getAttribute('href'),
+    })
+)
+"""
+
+# Configure logging; set LOG_LEVEL=DEBUG to print every extracted job
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
     format='%(message)s'
 )
 
-async def setup_browser():
+async def setup_browser(headless=True):
     """Set up and configure the browser with Playwright."""
     logging.info("Setting up browser...")
     try:
+        # Imported here so runs that never launch a browser (--export-xlsx) skip it
+        from playwright.async_api import async_playwright
         playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
+        browser = await playwright.chromium.launch(headless=headless)
         logging.info("Browser setup completed successfully")
-        return playwright, browser, context, page
+        return playwright, browser
     except Exception as e:
         logging.error(f"Failed to set up browser: {str(e)}")
         logging.error("System information:")
@@ -42,6 +70,58 @@ async def setup_browser():
         logging.error(f"Operating system: {platform.platform()}")
         raise
 
+# Resource types the scraper never needs; only the DOM text is read
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+async def block_unneeded_resources(route):
+    """Abort requests for assets that do not affect the job cards' text."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class BrowserPool:
+    """Launch Chromium once and hand out pages, each in its own browser context.
+
+    Launching the browser is the slowest part of a short scrape, so every
+    fetch in a run shares one instance instead of starting its own. At most
+    max_pages pages are open at once so concurrent fetches don't thrash Chromium.
+    """
+
+    def __init__(self, headless=True, max_pages=None):
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self.page_slots = asyncio.Semaphore(max_pages or os.cpu_count() or 1)
+
+    async def __aenter__(self):
+        self.playwright, self.browser = await setup_browser(self.headless)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+    async def acquire_page(self):
+        """Open a page in a fresh, isolated context, waiting for a free slot."""
+        await self.page_slots.acquire()
+        try:
+            context = await self.browser.new_context()
+            await context.route("**/*", block_unneeded_resources)
+            return await context.new_page()
+        except Exception:
+            self.page_slots.release()
+            raise
+
+    async def release(self, page):
+        """Close a page together with its context and free its slot."""
+        try:
+            await page.context.close()
+        finally:
+            self.page_slots.release()
+
 async def safe_click(page, selector, timeout=5000):
     """Safely click an element with timeout."""
     try:
@@ -51,205 +131,194 @@ async def safe_click(page, selector, timeout=5000):
         logging.warning(f"Failed to click element {selector}: {str(e)}")
         return False
 
-async def safe_get_text(page, selector, timeout=10000):
-    """Safely get text from an element with timeout."""
-    try:
-        element = await page.wait_for_selector(selector, timeout=timeout)
-        if element:
-            return await element.text_content()
-    except Exception as e:
-        logging.debug(f"Failed to get text from element {selector}: {str(e)}")
-    return ""
+def build_jobs_frame(cards, today):
+    """Clean raw job cards into a jobs DataFrame with column-wise passes."""
+    if not cards:
+        return pd.DataFrame(columns=SCRAPED_COLUMNS)
+    raw = pd.DataFrame.from_records(cards, columns=['title', 'company', 'timePosted', 'paragraphs', 'link'])
+    
+    # If any required field is missing, skip this job
+    raw = raw[raw['title'].fillna('').ne('') & raw['company'].fillna('').ne('')]
+    
+    jobs_df = pd.DataFrame({
+        'Title': raw['title'],
+        'Company': raw['company'],
+        # Location and job type are the first two paragraphs of the card,
+        # defaulting to Remote and Full-time
+        'Location': raw['paragraphs'].str[0].fillna('Remote'),
+        'Job Type': raw['paragraphs'].str[1].fillna('Full-time'),
+        'Time_Posted': raw['timePosted'].fillna(''),
+        'Link': raw['link'],
+    })
+    text_columns = ['Title', 'Company', 'Location', 'Job Type', 'Time_Posted']
+    jobs_df[text_columns] = jobs_df[text_columns].apply(lambda col: col.str.strip())
+    jobs_df = jobs_df.assign(**{'First Seen': today, 'Last Seen': today, 'Status': 'Active'})
+    
+    # Cards repeat across pages; keep the first occurrence of each job
+    return jobs_df.drop_duplicates(subset=list(ID_COLUMNS), ignore_index=True)
 
-async def extract_job_details(page, job_element):
-    """Extract job details with error handling for each field."""
+def generate_job_ids(df):
+    """Hash Title, Company and Location into uint64 Job IDs in one vectorized pass."""
+    return pd.util.hash_pandas_object(df[list(ID_COLUMNS)], index=False).astype('uint64').to_numpy()
+
+async def load_more_jobs(page, load_more, job_cards):
+    """Click the "Load more jobs" button and wait for the next batch; return False when none is left."""
     try:
-        # Required fields
-        title_elem = await job_element.query_selector("h3.font-bold")
-        company_elem = await job_element.query_selector("div.text-orange-600")
-        
-        # Get text content
-        title = await title_elem.text_content() if title_elem else ""
-        company = await company_elem.text_content() if company_elem else ""
-        
-        # Time posted
-        time_elem = await job_element.query_selector("p.hidden.sm\\:flex")
-        time_posted = await time_elem.text_content() if time_elem else ""
-        
-        # Location and job type are in flex container
-        info_container = await job_element.query_selector("div.flex.flex-col.gap-1.mt-2")
-        location = "Remote"  # Default to Remote
-        job_type = "Full-time"  # Default to Full-time
-        
-        if info_container:
-            # Location is usually in the first paragraph
-            paragraphs = await info_container.query_selector_all("p")
-            if len(paragraphs) >= 1:
-                location = await paragraphs[0].text_content()
-            if len(paragraphs) >= 2:
-                job_type = await paragraphs[1].text_content()
-        
-        # If any required field is missing, skip this job
-        if not all([title, company]):
-            return None
-
-        # Create job details dictionary
-        job_details = {
-            "Title": title.strip(),
-            "Company": company.strip(),
-            "Location": location.strip(),
-            "Job Type": job_type.strip(),
-            "Time_Posted": time_posted.strip(),
-            "Link": await job_element.get_attribute("href"),
-            "First Seen": datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-            "Last Seen": datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-            "Status": "Active"
-        }
-        
-        # Debug print
-        print(f"Extracted job: {job_details['Title']}")
-        print(f"Company: {job_details['Company']}")
-        print(f"Location: {job_details['Location']}")
-        print(f"Job Type: {job_details['Job Type']}")
-        print(f"Time Posted: {job_details['Time_Posted']}")
-        print("-" * 50)
-        
-        # Generate unique ID
-        job_details["Job ID"] = hashlib.md5(f"{job_details['Title']}{job_details['Company']}{job_details['Location']}".encode()).hexdigest()
-        
-        return job_details
-        
+        if await load_more.is_visible():
+            # Wait for the new cards to appear rather than for the network to go idle
+            prev_count = await job_cards.count()
+            await load_more.click()
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[JOB_CARD_SELECTOR, prev_count],
+                timeout=15000
+            )
+            return True
+        print("No more jobs to load")
     except Exception as e:
-        print(f"Error extracting job details: {str(e)}")
-        return None
-
-async def fetch_jobs():
-    """Fetch job entries from the website using Playwright."""
-    playwright = None
-    browser = None
-    context = None
+        print(f"Error loading more jobs: {str(e)}")
+    return False
+
+async def fetch_jobs(pool, url):
+    """Fetch job entries from one listing URL using a page from the pool, as a DataFrame."""
+    page = None
     
     try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
+        page = await pool.acquire_page()
         
-        jobs = []
+        # One timestamp for the whole run rather than a clock read per job
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        # Raw card fields from every page, cleaned together once scraping ends
+        cards = []
         page_num = 1
         
-        await page.goto(URL)
-        await page.wait_for_load_state('networkidle')
+        # Locators are built once and re-resolved on every use, so no element
+        # handles pile up in the browser across pages
+        job_cards = page.locator(JOB_CARD_SELECTOR)
+        load_more = page.locator(LOAD_MORE_SELECTOR).first
+        
+        await page.goto(url)
+        await page.wait_for_selector(JOB_CARD_SELECTOR, state='attached')
         
         while True:
             print(f"Scraping page {page_num}...")
             
-            # Wait for job elements to be present
-            job_elements = await page.query_selector_all("a.flex.flex-col[rel='noopener noreferrer']")
-            
-            # Track existing job IDs before processing new ones
-            existing_ids = {job['Job ID'] for job in jobs}
-            
-            page_jobs = []
-            for job_element in job_elements:
-                job_details = await extract_job_details(page, job_element)
-                if job_details and job_details['Job ID'] not in existing_ids:
-                    page_jobs.append(job_details)
-                    existing_ids.add(job_details['Job ID'])
-            
-            jobs.extend(page_jobs)
-            print(f"Found {len(page_jobs)} new unique jobs on page {page_num} (Total unique jobs: {len(jobs)})")
+            # Pull the fields of every job card out of the page in a single
+            # browser round-trip instead of one query per field per job
+            # Only read the cards appended since the last page; earlier ones are already in `cards`
+            page_cards = await page.evaluate(JOB_CARDS_SCRIPT, [JOB_CARD_SELECTOR, len(cards)])
+            cards.extend(page_cards)
+            print(f"Found {len(page_cards)} new job cards on page {page_num}")
             
-            # Try to find and click the "Load more jobs" button
-            try:
-                load_more = await page.query_selector("button:has-text('Load more jobs')")
-                if load_more and await load_more.is_visible():
-                    await load_more.click()
-                    await page.wait_for_load_state('networkidle')
-                    page_num += 1
-                else:
-                    print("No more jobs to load")
-                    break
-            except Exception as e:
-                print(f"Error loading more jobs: {str(e)}")
+            if not await load_more_jobs(page, load_more, job_cards):
                 break
-                
-        return jobs
+            page_num += 1
+        
+        jobs_df = build_jobs_frame(cards, today)
+        print(f"Total unique jobs: {len(jobs_df)}")
+        
+        # Debug output, skipped entirely unless debug logging is enabled
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            debug_columns = ['Title', 'Company', 'Location', 'Job Type', 'Time_Posted']
+            logging.debug("Extracted jobs:\n%s", jobs_df[debug_columns].to_string(index=False))
+        
+        return jobs_df
         
     except Exception as e:
-        print(f"Error during scraping: {str(e)}")
-        return []
+        print(f"Error during scraping {url}: {str(e)}")
+        return pd.DataFrame(columns=SCRAPED_COLUMNS)
         
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if playwright:
-            await playwright.stop()
+        if page:
+            await pool.release(page)
+
+def empty_jobs_frame():
+    """Return an empty job store with the dtypes a loaded store would have."""
+    return pd.DataFrame(columns=['Job ID', 'Title', 'Company', 'Location', 'Job Type',
+                                 'Link', 'First Seen', 'Last Seen', 'Status']).astype(
+        {'Job ID': 'uint64', 'First Seen': 'datetime64[ns]'})
 
 def load_existing_jobs():
-    """Load existing jobs from the spreadsheet."""
+    """Load existing jobs from the Parquet store, migrating the legacy spreadsheet if needed."""
     try:
         if os.path.exists(FILE_NAME):
-            df = pd.read_excel(FILE_NAME)
-            # Ensure all required columns exist
-            required_columns = ['Job ID', 'Title', 'Company', 'Location', 'Job Type', 
-                              'Link', 'First Seen', 'Last Seen', 'Status']
-            for col in required_columns:
-                if col not in df.columns:
-                    df[col] = ''
-            return df
-        return pd.DataFrame(columns=['Job ID', 'Title', 'Company', 'Location', 'Job Type', 
-                                   'Link', 'First Seen', 'Last Seen', 'Status'])
+            df = pd.read_parquet(FILE_NAME)
+        elif os.path.exists(LEGACY_FILE_NAME):
+            # One-time migration: the next save writes the Parquet store
+            print(f"Migrating {LEGACY_FILE_NAME} to {FILE_NAME}")
+            df = pd.read_excel(LEGACY_FILE_NAME, engine='calamine')
+        else:
+            return empty_jobs_frame()
+        # Ensure all required columns exist
+        required_columns = ['Job ID', 'Title', 'Company', 'Location', 'Job Type', 
+                          'Link', 'First Seen', 'Last Seen', 'Status']
+        for col in required_columns:
+            if col not in df.columns:
+                df[col] = ''
+        # Rows saved before IDs were hashed to uint64 carry md5 hex strings
+        if df['Job ID'].dtype != 'uint64':
+            df['Job ID'] = generate_job_ids(df)
+        # Parse dates once here; First Seen stays datetime64 through update and save
+        if not pd.api.types.is_datetime64_any_dtype(df['First Seen']):
+            df['First Seen'] = pd.to_datetime(df['First Seen'], format='%Y-%m-%d')
+        return df
     except Exception as e:
         print(f"Error loading existing jobs: {e}")
-        return pd.DataFrame(columns=['Job ID', 'Title', 'Company', 'Location', 'Job Type', 
-                                   'Link', 'First Seen', 'Last Seen', 'Status'])
+        return empty_jobs_frame()
 
-def update_job_listings(existing_df, new_jobs):
-    """Update existing job listings with new data."""
+def update_job_listings(existing_df, new_df):
+    """Update existing job listings with the newly scraped jobs DataFrame."""
     today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
     
-    # Convert new jobs to DataFrame
-    new_df = pd.DataFrame(new_jobs)
-    
-    # Mark all existing jobs as not seen today
-    existing_df['Status'] = 'Inactive'
-    
-    # Process each new job
-    for _, new_job in new_df.iterrows():
-        # Check if job already exists
-        existing_job = existing_df[existing_df['Job ID'] == new_job['Job ID']]
-        
-        if len(existing_job) > 0:
-            # Update existing job
-            existing_df.loc[existing_job.index, 'Last Seen'] = today
-            existing_df.loc[existing_job.index, 'Status'] = 'Active'
-        else:
-            # Add new job
-            existing_df = pd.concat([existing_df, pd.DataFrame([new_job])], ignore_index=True)
-    
+    existing_df = existing_df.astype({'Job ID': 'uint64'})
+    job_ids = generate_job_ids(new_df) if len(new_df) else np.empty(0, dtype='uint64')
+    new_df = new_df.assign(**{
+        'Job ID': job_ids,
+        'First Seen': pd.to_datetime(new_df['First Seen'], format='%Y-%m-%d', cache=True)
+    })
+
+    # Two-way diff on the Job ID columns, no Python-level row loop
+    existing_ids = existing_df['Job ID'].to_numpy()
+    new_ids = new_df['Job ID'].to_numpy()
+    still_listed = np.isin(existing_ids, new_ids)
+
+    # Refresh jobs still on the site and mark the rest as not seen today
+    existing_df.loc[still_listed, ['Last Seen', 'Status']] = [today, 'Active']
+    existing_df.loc[~still_listed, 'Status'] = 'Inactive'
+
+    # Append the genuinely new jobs with a single concat; on a first run there is nothing to append to
+    fresh = new_df[~np.isin(new_ids, existing_ids)]
+    if len(existing_df):
+        existing_df = pd.concat([existing_df, fresh], ignore_index=True)
+    else:
+        existing_df = fresh.reset_index(drop=True)
+
     # Sort by First Seen date (newest first) and Status (Active first)
-    existing_df['First Seen'] = pd.to_datetime(existing_df['First Seen'])
     existing_df = existing_df.sort_values(['Status', 'First Seen'], 
                                         ascending=[True, False]).reset_index(drop=True)
     
     return existing_df
 
+def export_jobs_xlsx(df):
+    """Write a human-readable copy of the jobs with the xlsxwriter engine."""
+    # uint64 IDs exceed Excel's number precision, so show them as hex
+    export_df = df.assign(**{'Job ID': df['Job ID'].map('{:016x}'.format)})
+    with pd.ExcelWriter(EXPORT_FILE_NAME, engine='xlsxwriter',
+                        date_format='YYYY-MM-DD', datetime_format='YYYY-MM-DD') as writer:
+        export_df.to_excel(writer, index=False)
+    print(f"Exported {len(df)} jobs to {EXPORT_FILE_NAME}")
+
 def save_jobs(df):
-    """Save jobs to the spreadsheet with error handling."""
+    """Save jobs to the Parquet store with error handling."""
     try:
-        # Convert datetime back to string format for Excel
-        df['First Seen'] = df['First Seen'].dt.strftime('%Y-%m-%d')
-        
-        # Save to Excel
-        df.to_excel(FILE_NAME, index=False)
+        # Parquet keeps First Seen as datetime64, so no string round-trip is needed
+        df.to_parquet(FILE_NAME, compression='zstd', index=False)
         print(f"Successfully saved {len(df)} jobs to {FILE_NAME}")
         
-        # Print summary
-        active_jobs = len(df[df['Status'] == 'Active'])
-        inactive_jobs = len(df[df['Status'] == 'Inactive'])
+        # Print summary, counting every status in a single pass
+        status_counts = df['Status'].value_counts()
+        active_jobs = status_counts.get('Active', 0)
+        inactive_jobs = status_counts.get('Inactive', 0)
         print(f"\nSummary:")
         print(f"Active jobs: {active_jobs}")
         print(f"Inactive jobs: {inactive_jobs}")
@@ -266,15 +335,36 @@ async def main():
     existing_df = load_existing_jobs()
     print(f"Loaded {len(existing_df)} existing jobs")
     
-    # Fetch new jobs
-    new_jobs = await fetch_jobs()
-    print(f"Fetched {len(new_jobs)} jobs from website")
+    # Fetch new jobs from every source concurrently, sharing one browser
+    async with BrowserPool() as pool:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(fetch_jobs(pool, url)) for url in URLS]
+    new_df = pd.concat([task.result() for task in tasks], ignore_index=True)
+    new_df = new_df.drop_duplicates(subset=list(ID_COLUMNS), ignore_index=True)
+    print(f"Fetched {len(new_df)} jobs from website")
     
     # Update job listings
-    updated_df = update_job_listings(existing_df, new_jobs)
+    updated_df = update_job_listings(existing_df, new_df)
     
     # Save updated data
     save_jobs(updated_df)
 
+def parse_args():
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Scrape CrewAI job listings.")
+    parser.add_argument('--export-xlsx', action='store_true',
+                        help=f"write {EXPORT_FILE_NAME} from the job store and exit without scraping")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    if parse_args().export_xlsx:
+        export_jobs_xlsx(load_existing_jobs())
+        sys.exit()
+    
+    # Use libuv's faster event loop when available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())